@@ -3,21 +3,16 @@ import re
 import shutil
 import subprocess
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
-from videolingo.core import (
-    step2_whisperX,
-    step3_1_spacy_split,
-    step3_2_splitbymeaning,
-    step4_1_summarize,
-    step4_2_translate_all,
-    step5_splitforsub,
-    step6_generate_final_timeline,
-)
 from videolingo.core.config_utils import load_key
 from videolingo.core.onekeycleanup import cleanup
 from videolingo.core.step1_ytdlp import download_video_ytdlp, find_video_files
 
 SUB_VIDEO = "output/output_sub.mp4"
+_CLEAN_RE = re.compile(r"[^\w\-_\.]")
+_RES_DICT = {"360p": "360", "1080p": "1080", "Best": "best"}
+_AUDIO_EXTS = frozenset(load_key("allowed_audio_formats"))
 
 
 def prepare_video():
@@ -65,13 +60,12 @@ def prepare_video():
     if action == "1":
         # YouTube video download
         url = input("Enter YouTube link: ").strip()
-        res_dict = {"360p": "360", "1080p": "1080", "Best": "best"}
         print("Choose resolution:")
-        for i, key in enumerate(res_dict.keys(), start=1):
+        for i, key in enumerate(_RES_DICT, start=1):
             print(f"{i}. {key}")
         try:
             res_choice = int(input("Enter the number for the desired resolution: ").strip())
-            res = list(res_dict.values())[res_choice - 1]
+            res = list(_RES_DICT.values())[res_choice - 1]
         except (IndexError, ValueError):
             print("Invalid choice. Defaulting to 'best' resolution.")
             res = "best"
@@ -88,21 +82,30 @@ def prepare_video():
 
         raw_name = os.path.basename(file_path).replace(" ", "_")
         name, ext = os.path.splitext(raw_name)
-        clean_name = re.sub(r"[^\w\-_\.]", "", name) + ext.lower()
+        clean_name = _CLEAN_RE.sub("", name) + ext.lower()
 
         dest_path = os.path.join("output", clean_name)
-        if os.path.exists(dest_path):
+        if os.path.exists(dest_path) and os.path.samefile(file_path, dest_path):
+            print(f"File '{clean_name}' is already in the output folder.")
+        elif os.path.exists(dest_path):
             print(f"File '{clean_name}' already exists in the output folder.")
             overwrite = input("Do you want to overwrite it? (y/n): ").strip().lower()
             if overwrite != "y":
                 print("Upload skipped. Retaining the existing file.")
                 return
-
-        shutil.copy2(file_path, dest_path)
+            os.remove(dest_path)
+
+        if not os.path.exists(dest_path):
+            try:
+                # Same filesystem: a hard link avoids copying the whole file
+                os.link(file_path, dest_path)
+            except OSError:
+                # Different filesystem or no hard link support
+                shutil.copyfile(file_path, dest_path)
         print(f"File uploaded and saved as {clean_name} in the 'output' folder.")
 
         # Check if the file is an audio file
-        if clean_name.split(".")[-1] in load_key("allowed_audio_formats"):
+        if ext.lower().lstrip(".") in _AUDIO_EXTS:
             convert_audio_to_video(dest_path)
             print("Audio file converted to video.")
     else:
@@ -113,25 +116,39 @@ def convert_audio_to_video(audio_file: str) -> str:
     output_video = "output/black_screen.mp4"
     if not os.path.exists(output_video):
         print(f"🎵➡️🎬 Converting audio <{audio_file}> to video with FFmpeg ......")
+        # A 1 fps still-image encode keeps x264 work to a handful of frames regardless of audio length
         ffmpeg_cmd = [
             "ffmpeg",
             "-y",
+            "-loglevel",
+            "error",
             "-f",
             "lavfi",
             "-i",
-            "color=c=black:s=640x360",
+            "color=c=black:s=640x360:r=1",
             "-i",
             audio_file,
             "-shortest",
             "-c:v",
             "libx264",
+            "-tune",
+            "stillimage",
+            "-preset",
+            "ultrafast",
+            "-crf",
+            "30",
             "-c:a",
             "aac",
             "-pix_fmt",
             "yuv420p",
             output_video,
         ]
-        subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True, encoding="utf-8")
+        try:
+            # only errors reach stderr with `-loglevel error`, so nothing else needs to be captured
+            subprocess.run(ffmpeg_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ FFmpeg failed to convert <{audio_file}>: {e.stderr.decode('utf-8', errors='replace')}")
+            raise
         print(f"🎵➡️🎬 Converted <{audio_file}> to <{output_video}> with FFmpeg\n")
         # delete audio file
         os.remove(audio_file)
@@ -150,11 +167,13 @@ def create_subtitle_zip(output_dir="output", zip_file_name="subtitles.zip"):
         str: Path to the created zip file.
     """
     zip_path = os.path.join(output_dir, zip_file_name)
-    with zipfile.ZipFile(zip_path, "w") as zip_file:
-        for file_name in os.listdir(output_dir):
-            if file_name.endswith(".srt"):
-                file_path = os.path.join(output_dir, file_name)
-                zip_file.write(file_path, arcname=file_name)
+    with zipfile.ZipFile(
+        zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6, allowZip64=True
+    ) as zip_file:
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".srt"):
+                    zip_file.write(entry.path, arcname=entry.name)
     return zip_path
 
 
@@ -208,15 +227,37 @@ def text_processing():
 def process_text():
     """
     Core text processing pipeline with detailed status messages.
+
+    Every step consumes the files written by the previous one, so the steps run in order.
+    The only independent work is loading the spaCy model: when the WhisperX language is
+    fixed in the config, the model is known up front and is loaded while transcription runs.
+    With `auto`, the model depends on the detected language and is loaded after transcription.
     """
-    print("Starting transcription with WhisperX...")
-    step2_whisperX.transcribe()
-    print("Transcription completed.")
-    import sys; sys.exit(1)
+    # Imported here so that preparing the video, zipping and cleanup don't pay for torch/whisperX/spaCy
+    from videolingo.core import (
+        step2_whisperX,
+        step3_1_spacy_split,
+        step3_2_splitbymeaning,
+        step4_1_summarize,
+        step4_2_translate_all,
+        step5_splitforsub,
+        step6_generate_final_timeline,
+    )
+    from videolingo.core.spacy_utils.load_nlp_model import init_nlp
+
+    whisper_language = load_key("whisper.language")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        nlp_future = executor.submit(init_nlp, whisper_language) if whisper_language != "auto" else None
+
+        print("Starting transcription with WhisperX...")
+        step2_whisperX.transcribe()
+        print("Transcription completed.")
+
+        nlp = nlp_future.result() if nlp_future else None
 
     print("Splitting long sentences using NLP...")
-    step3_1_spacy_split.split_by_spacy()
-    step3_2_splitbymeaning.split_sentences_by_meaning()
+    step3_1_spacy_split.split_by_spacy(nlp=nlp)
+    step3_2_splitbymeaning.split_sentences_by_meaning(nlp=nlp)
     print("Sentence segmentation completed.")
 
     print("Summarizing and translating...")
@@ -1,40 +1,61 @@
 import atexit
 import functools
-import inspect
 import json
 import os
-from collections import defaultdict
-from threading import Lock
+import sys
+from collections import Counter, defaultdict
+from threading import Event, Lock, Thread
 from time import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class APICounter:
     def __init__(self, save_interval=300):  # 5 minutes default
         self.COUNTER_FILE = "output/api_counter.json"
-        self.lock = Lock()
+        self.lock = Lock()  # only serializes file writes, not increments
         self.save_interval = save_interval
         self.last_save_time = time()
-        self.counter_data = {}
+        # func_name -> [total_calls, calls by module]
+        self.counter_data = defaultdict(lambda: [0, Counter()])
         self.is_modified = False
 
         # Load existing data on initialization
         self._load_counter()
 
+        # Periodically flush from a background thread instead of on the increment path
+        self._stop_flusher = Event()
+        self._flusher = Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
         # Register save on exit
-        atexit.register(self.save_counter)
+        atexit.register(self._flush_now)
 
     def _load_counter(self):
         """Load the counter data from file"""
         if os.path.exists(self.COUNTER_FILE):
             try:
-                with open(self.COUNTER_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Convert regular dicts to defaultdict for module counts
+                with open(self.COUNTER_FILE, "rb") as f:
+                    data = orjson.loads(f.read()) if orjson is not None else json.loads(f.read())
                     for func in data:
-                        data[func]["by_module"] = defaultdict(int, data[func]["by_module"])
-                    self.counter_data = data
+                        self.counter_data[func] = [data[func]["total_calls"], Counter(data[func]["by_module"])]
             except (json.JSONDecodeError, FileNotFoundError):
-                self.counter_data = {}
+                self.counter_data.clear()
+
+    def _flush_loop(self):
+        while not self._stop_flusher.wait(self.save_interval):
+            self.save_counter(force=True)
+
+    def _flush_now(self):
+        self._stop_flusher.set()
+        self.save_counter(force=True)
+
+    def _snapshot(self):
+        # list()/dict() copies run in C without releasing the GIL, so they are safe against concurrent increments
+        return {func: (data[0], dict(data[1])) for func, data in list(self.counter_data.items())}
 
     def save_counter(self, force=False):
         """Save the counter data to file if modified and enough time has passed"""
@@ -46,75 +67,81 @@ class APICounter:
             return
 
         with self.lock:
+            self.is_modified = False
+            snapshot = self._snapshot()
             os.makedirs(os.path.dirname(self.COUNTER_FILE), exist_ok=True)
-            # Convert defaultdict to regular dict for JSON serialization
-            serializable_data = {}
-            for func, data in self.counter_data.items():
-                serializable_data[func] = {"total_calls": data["total_calls"], "by_module": dict(data["by_module"])}
+            serializable_data = {
+                func: {"total_calls": total_calls, "by_module": by_module}
+                for func, (total_calls, by_module) in snapshot.items()
+            }
 
-            with open(self.COUNTER_FILE, "w", encoding="utf-8") as f:
-                json.dump(serializable_data, f, indent=4)
+            with open(self.COUNTER_FILE, "wb") as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(serializable_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                else:
+                    f.write(json.dumps(serializable_data, indent=4).encode("utf-8"))
 
             self.last_save_time = current_time
-            self.is_modified = False
-
-    def increment(self, func_name, module_name):
-        """Increment counters for a function call"""
-        with self.lock:
-            if func_name not in self.counter_data:
-                self.counter_data[func_name] = {"total_calls": 0, "by_module": defaultdict(int)}
-
-            self.counter_data[func_name]["total_calls"] += 1
-            self.counter_data[func_name]["by_module"][module_name] += 1
-            self.is_modified = True
 
-            # Try to save if enough time has passed
-            self.save_counter()
+    def increment(self, func_name, module_name, count=1):
+        """Increment counters for `count` calls of a function"""
+        # Lock-free: a rare lost increment under heavy contention is acceptable for usage statistics
+        data = self.counter_data[func_name]
+        data[0] += count
+        data[1][module_name] += count
+        self.is_modified = True
 
     def get_stats(self):
         """Get current statistics"""
-        with self.lock:
-            stats = {
-                "total_api_calls": sum(data["total_calls"] for data in self.counter_data.values()),
-                "by_function": {func: data["total_calls"] for func, data in self.counter_data.items()},
-                "by_module": defaultdict(int),
-            }
+        snapshot = self._snapshot()
+        stats = {
+            "total_api_calls": sum(total_calls for total_calls, _ in snapshot.values()),
+            "by_function": {func: total_calls for func, (total_calls, _) in snapshot.items()},
+            "by_module": defaultdict(int),
+        }
 
-            for func_data in self.counter_data.values():
-                for module, count in func_data["by_module"].items():
-                    stats["by_module"][module] += count
+        for _, by_module in snapshot.values():
+            for module, count in by_module.items():
+                stats["by_module"][module] += count
 
-            return dict(stats)
+        return dict(stats)
 
 
 # Global counter instance
 api_counter = APICounter()
 
 
+def _get_caller_module():
+    """Return the module that called the decorated function, skipping the LLM wrappers that delegate to each other."""
+    frame = sys._getframe(2)  # skip this helper and the decorator's wrapper
+    module_name = frame.f_globals.get("__name__", "unknown_module")
+    while module_name.endswith(("ask_gpt", "ask_claude")) and frame.f_back is not None:
+        frame = frame.f_back
+        module_name = frame.f_globals.get("__name__", "unknown_module")
+    return module_name
+
+
 def count_api_calls(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        # Get caller information
-        frame = inspect.currentframe()
-        caller_frame = frame.f_back
-        while caller_frame:
-            module_name = inspect.getmodule(caller_frame).__name__
-            if not module_name.endswith(("ask_gpt", "ask_claude")):
-                break
-            caller_frame = caller_frame.f_back
-
-        module_name = module_name if module_name else "unknown_module"
-
-        # Increment counter
-        api_counter.increment(func.__name__, module_name)
-
-        try:
-            return func(*args, **kwargs)
-        finally:
-            if frame:
-                del frame
-            if caller_frame:
-                del caller_frame
+        api_counter.increment(func.__name__, _get_caller_module())
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def count_batch_api_calls(func):
+    """
+    Like `count_api_calls` for functions taking a list of prompts first; counts one call per prompt.
+
+    The wrapper is synchronous so that for coroutine functions the caller is recorded when the
+    coroutine is created, while the real caller is still on the stack.
+    """
+
+    @functools.wraps(func)
+    def wrapper(prompts, *args, **kwargs):
+        api_counter.increment(func.__name__, _get_caller_module(), count=len(prompts))
+        return func(prompts, *args, **kwargs)
 
     return wrapper
 
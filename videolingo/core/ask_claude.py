@@ -1,46 +1,305 @@
+import asyncio
+import functools
+import hashlib
+import importlib.util
 import json
 import os
 import time
+import weakref
 from threading import Lock
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from anthropic import Anthropic
+import httpx
+from anthropic import Anthropic, APIConnectionError, AsyncAnthropic, InternalServerError, RateLimitError
 from requests.exceptions import RequestException
 from videolingo.core.config_utils import load_key
-from videolingo.core.api_utils import count_api_calls
+from videolingo.core.api_utils import count_api_calls, count_batch_api_calls
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
 
 LOG_FOLDER = "output/claude_log"
 LOCK = Lock()
+# network/server errors worth backing off for; the SDK raises its own types rather than requests'
+TRANSIENT_ERRORS = (RequestException, APIConnectionError, RateLimitError, InternalServerError)
+# `httpx[http2]` in requirements.txt pulls in `h2`; without it httpx would refuse http2=True, so fall back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# JSON responses are requested as a forced tool call, so Claude returns an already-parsed object
+JSON_TOOL = {
+    "name": "output",
+    "description": "Return the response as a JSON object.",
+    "input_schema": {"type": "object"},
+}
+
+# prompt-hash -> response index per log_title, loaded from disk once and kept in sync by save_log
+_HISTORY: Dict[str, Dict[str, Any]] = {}
+_LOADED: Set[str] = set()
+# per event loop, log_title -> (queue, writer task) used by the async path
+_LOG_WRITERS: "weakref.WeakKeyDictionary[Any, Dict[str, Tuple[asyncio.Queue, asyncio.Task]]]"
+_LOG_WRITERS = weakref.WeakKeyDictionary()
+# per event loop, api_key -> async client
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[Any, Dict[str, AsyncAnthropic]]"
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+
+def _dumps_line(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 
 def save_log(model: str, prompt: str, response: Any, log_title: str = "default", message: Optional[str] = None) -> None:
-    """Save the interaction log to a JSON file."""
+    """Append the interaction log to a JSONL file, one record per line."""
     os.makedirs(LOG_FOLDER, exist_ok=True)
     log_data = {"model": model, "prompt": prompt, "response": response, "message": message}
-    log_file = os.path.join(LOG_FOLDER, f"{log_title}.json")
+    log_file = os.path.join(LOG_FOLDER, f"{log_title}.jsonl")
 
-    if os.path.exists(log_file):
-        with open(log_file, "r", encoding="utf-8") as f:
-            logs = json.load(f)
-    else:
-        logs = []
-    logs.append(log_data)
-    with open(log_file, "w", encoding="utf-8") as f:
-        json.dump(logs, f, ensure_ascii=False, indent=4)
+    with LOCK:
+        with open(log_file, "ab") as f:
+            f.write(_dumps_line(log_data))
+        _HISTORY.setdefault(log_title, {}).setdefault(_prompt_key(prompt), response)
+
+
+def _append_bytes(log_file: str, data: bytes) -> None:
+    with open(log_file, "ab") as f:
+        f.write(data)
+
+
+async def _log_writer(log_file: str, queue: asyncio.Queue) -> None:
+    """Append queued log records to `log_file` until a `None` sentinel arrives, batching whatever is pending."""
+    done = False
+    while not done:
+        items = [await queue.get()]
+        while not queue.empty():
+            items.append(queue.get_nowait())
+        if None in items:
+            done = True
+            items = items[: items.index(None)]
+        if not items:
+            continue
+        try:
+            data = b"".join(_dumps_line(item) for item in items)
+            if aiofiles is not None:
+                async with aiofiles.open(log_file, "ab") as f:
+                    await f.write(data)
+            else:
+                await asyncio.to_thread(_append_bytes, log_file, data)
+        except Exception as e:
+            # keep draining: a dead writer would silently drop every record queued after this one
+            print(f"❎ Failed to write {len(items)} log record(s) to `{log_file}`: {e}")
+
+
+def queue_log(
+    model: str, prompt: str, response: Any, log_title: str = "default", message: Optional[str] = None
+) -> None:
+    """Non-blocking `save_log` for coroutines: hand the record to this loop's writer task for `log_title`."""
+    loop = asyncio.get_running_loop()
+    writers = _LOG_WRITERS.setdefault(loop, {})
+    if log_title not in writers:
+        os.makedirs(LOG_FOLDER, exist_ok=True)
+        queue = asyncio.Queue()
+        task = loop.create_task(_log_writer(os.path.join(LOG_FOLDER, f"{log_title}.jsonl"), queue))
+        writers[log_title] = (queue, task)
+    writers[log_title][0].put_nowait({"model": model, "prompt": prompt, "response": response, "message": message})
+    with LOCK:
+        _HISTORY.setdefault(log_title, {}).setdefault(_prompt_key(prompt), response)
+
+
+async def flush_logs() -> None:
+    """Wait until every record queued by `queue_log` on the running loop is written, then stop its writers."""
+    writers = _LOG_WRITERS.pop(asyncio.get_running_loop(), {})
+    for queue, _ in writers.values():
+        queue.put_nowait(None)
+    await asyncio.gather(*(task for _, task in writers.values()))
 
 
 def check_ask_claude_history(prompt: str, model: str, log_title: str) -> Any:
     """Check if the prompt has been asked before and return the cached response."""
-    if not os.path.exists(LOG_FOLDER):
-        return False
-    file_path = os.path.join(LOG_FOLDER, f"{log_title}.json")
-    if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            for item in data:
-                if item["prompt"] == prompt:
-                    return item["response"]
-    return False
+    if log_title not in _LOADED:
+        history = _HISTORY.setdefault(log_title, {})
+        # logs written before the switch to JSONL are a single JSON array in `{log_title}.json`
+        legacy_path = os.path.join(LOG_FOLDER, f"{log_title}.json")
+        if os.path.exists(legacy_path):
+            with open(legacy_path, "rb") as f:
+                for item in _loads(f.read()):
+                    history.setdefault(_prompt_key(item["prompt"]), item["response"])
+        file_path = os.path.join(LOG_FOLDER, f"{log_title}.jsonl")
+        if os.path.exists(file_path):
+            skipped = 0
+            line = b"\n"
+            with open(file_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        item = _loads(line)
+                        history.setdefault(_prompt_key(item["prompt"]), item["response"])
+                    except (ValueError, KeyError, TypeError):
+                        # e.g. a record torn by an interrupted append; only that record is lost
+                        skipped += 1
+            if not line.endswith(b"\n"):
+                # terminate a torn last record so the next append starts on its own line
+                _append_bytes(file_path, b"\n")
+            if skipped:
+                print(f"⚠️ Skipped {skipped} unreadable line(s) in `{file_path}`")
+        _LOADED.add(log_title)
+    return _HISTORY[log_title].get(_prompt_key(prompt), False)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(api_key: str) -> Anthropic:
+    """Return a shared client per API key so its connection pool is reused across calls."""
+    return Anthropic(api_key=api_key)
+
+
+def _get_async_client(api_key: str) -> AsyncAnthropic:
+    """
+    Return a shared async client per API key for the running event loop, on HTTP/2 when `h2` is installed.
+
+    Pooled connections are bound to the loop that opened them, so each `asyncio.run` gets its own client.
+    """
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    if api_key not in clients:
+        http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=httpx.Limits(max_connections=32))
+        clients[api_key] = AsyncAnthropic(api_key=api_key, http_client=http_client)
+    return clients[api_key]
+
+
+async def close_async_clients() -> None:
+    """Close the running loop's async clients so their pooled connections don't outlive the loop."""
+    clients = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+def _load_api_set() -> Dict:
+    # Load API configuration
+    api_set = load_key("api")
+
+    # Verify required configuration exists
+    if not api_set.get("claude_key"):
+        raise ValueError("⚠️ claude_key is missing in api configuration")
+    if not api_set.get("claude_model"):
+        raise ValueError("⚠️ claude_model is missing in api configuration")
+    return api_set
+
+
+def _build_api_params(
+    api_set: Dict,
+    prompt: str,
+    response_json: bool,
+    system_prompt: Optional[str],
+    max_tokens: Optional[int],
+    temperature: float,
+) -> Dict:
+    # Prepare the messages
+    messages = [{"role": "user", "content": prompt}]
+
+    # If JSON response is requested, add it to the system prompt
+    final_system_prompt = system_prompt or ""
+    if response_json:
+        json_instruction = "Please provide your response in valid JSON format."
+        final_system_prompt = f"{final_system_prompt}\n{json_instruction}" if final_system_prompt else json_instruction
+
+    # Prepare API call parameters
+    api_params = {
+        "model": api_set.get("claude_model", "claude-3-opus-20240229"),
+        "messages": messages,
+        "temperature": temperature,
+    }
+
+    # Add optional parameters only if they have valid values
+    if final_system_prompt:
+        api_params["system"] = final_system_prompt
+    if isinstance(max_tokens, int) and max_tokens > 0:
+        api_params["max_tokens"] = max_tokens
+    if response_json:
+        api_params["tools"] = [JSON_TOOL]
+        api_params["tool_choice"] = {"type": "tool", "name": JSON_TOOL["name"]}
+    return api_params
+
+
+def _parse_response(
+    response: Any, api_set: Dict, prompt: str, response_json: bool, valid_def: Optional[Callable[[Dict], Dict]]
+) -> Any:
+    """Extract the response content, raising `json.JSONDecodeError` or `ValueError` if it should be retried."""
+    if not response_json:
+        return response.content[0].text
+
+    tool_input = next((block.input for block in response.content if block.type == "tool_use"), None)
+    if tool_input is not None:
+        response_data = tool_input
+    else:
+        # No tool call came back, fall back to parsing the text
+        response_content = next((block.text for block in response.content if block.type == "text"), "")
+        try:
+            response_data = json.loads(response_content)
+        except json.JSONDecodeError:
+            print(f"❎ JSON parsing failed. Retrying: '''{response_content}'''")
+            save_log(api_set["model"], prompt, response_content, log_title="error", message="JSON parsing failed.")
+            raise
+
+    # Validate response if validation function provided
+    if valid_def:
+        valid_response = valid_def(response_data)
+        if valid_response["status"] != "success":
+            save_log(
+                api_set["claude_model"],
+                prompt,
+                response_data,
+                log_title="error",
+                message=valid_response["message"],
+            )
+            raise ValueError(f"❎ API response error: {valid_response['message']}")
+    return response_data
+
+
+def _prepare_retry(e: Exception, attempt: int, max_retries: int, json_failures: int, api_params: Dict) -> float:
+    """
+    Raise once retries are exhausted, otherwise prepare `api_params` for the next attempt.
+
+    Args:
+        json_failures: JSON parsing failures so far, including `e` if it is one
+
+    Returns:
+        Seconds to wait before retrying
+    """
+    if isinstance(e, json.JSONDecodeError):
+        # Malformed JSON is not transient: resending the same request rarely helps, so it gets its own
+        # budget of half the attempts, retries immediately and samples less randomly
+        json_attempts = (max_retries + 1) // 2
+        if json_failures >= json_attempts or attempt == max_retries - 1:
+            raise Exception(
+                f"Still failed after {attempt + 1} attempts: JSON parsing failed {json_failures} time(s): {e}\n"
+                f"Please check your network connection or API key or `{LOG_FOLDER}/error.jsonl` to debug."
+            )
+        api_params["temperature"] = max(0.0, api_params["temperature"] - 0.3)
+        print(
+            f"Retrying with temperature {api_params['temperature']:.1f} "
+            f"(JSON attempt {json_failures + 1}/{json_attempts})..."
+        )
+        return 0
+    if attempt == max_retries - 1:
+        raise Exception(f"Still failed after {max_retries} attempts: {e}")
+    if isinstance(e, TRANSIENT_ERRORS):
+        print(f"Request error: {e}. Retrying ({attempt + 1}/{max_retries})...")
+        return 2 ** (attempt + 1)  # exponential backoff
+    print(f"Unexpected error occurred: {e}\nRetrying...")
+    return 2
 
 
 @count_api_calls
@@ -68,105 +327,108 @@ def ask_claude(
     Returns:
         Parsed JSON response or raw text response
     """
-    # Load API configuration
-    api_set = load_key("api")
-
-    # Verify required configuration exists
-    if not api_set.get("claude_key"):
-        raise ValueError("⚠️ claude_key is missing in api configuration")
-    if not api_set.get("claude_model"):
-        raise ValueError("⚠️ claude_model is missing in api configuration")
+    api_set = _load_api_set()
 
     with LOCK:
         history_response = check_ask_claude_history(prompt, api_set["claude_model"], log_title)
         if history_response:
             return history_response
 
-    # Configuration check already done above
+    client = _get_client(api_set["claude_key"])
+    api_params = _build_api_params(api_set, prompt, response_json, system_prompt, max_tokens, temperature)
 
-    client = Anthropic(api_key=api_set["claude_key"])
+    max_retries = 3
+    json_failures = 0
+    for attempt in range(max_retries):
+        try:
+            response = client.messages.create(**api_params)
+            response_data = _parse_response(response, api_set, prompt, response_json, valid_def)
+            break
+        except Exception as e:
+            json_failures += isinstance(e, json.JSONDecodeError)
+            time.sleep(_prepare_retry(e, attempt, max_retries, json_failures, api_params))
 
-    # Prepare the messages
-    messages = [{"role": "user", "content": prompt}]
+    if log_title != "None":
+        save_log(api_set["model"], prompt, response_data, log_title=log_title)
 
-    # If JSON response is requested, add it to the system prompt
-    final_system_prompt = system_prompt or ""
-    if response_json:
-        json_instruction = "Please provide your response in valid JSON format."
-        final_system_prompt = f"{final_system_prompt}\n{json_instruction}" if final_system_prompt else json_instruction
+    return response_data
+
+
+async def ask_claude_async(
+    prompt: str,
+    response_json: bool = True,
+    valid_def: Optional[Callable[[Dict], Dict]] = None,
+    log_title: str = "default",
+    system_prompt: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    temperature: float = 1.0,
+) -> Any:
+    """
+    Async counterpart of `ask_claude` on the running loop's shared `AsyncAnthropic` client; takes the same arguments.
+
+    Not counted by `count_api_calls`: from inside a task the caller is no longer on the stack, so callers
+    go through `ask_claude_many`, which counts its prompts when the coroutine is created.
+    The interaction log is written in the background, so `await flush_logs()` and `await close_async_clients()`
+    before the event loop ends.
+    """
+    api_set = _load_api_set()
+
+    with LOCK:
+        history_response = check_ask_claude_history(prompt, api_set["claude_model"], log_title)
+        if history_response:
+            return history_response
+
+    client = _get_async_client(api_set["claude_key"])
+    api_params = _build_api_params(api_set, prompt, response_json, system_prompt, max_tokens, temperature)
 
     max_retries = 3
+    json_failures = 0
     for attempt in range(max_retries):
         try:
-            # Prepare API call parameters
-            api_params = {
-                "model": api_set.get("claude_model", "claude-3-opus-20240229"),
-                "messages": messages,
-                "temperature": temperature,
-            }
-
-            # Add optional parameters only if they have valid values
-            if final_system_prompt:
-                api_params["system"] = final_system_prompt
-            if isinstance(max_tokens, int) and max_tokens > 0:
-                api_params["max_tokens"] = max_tokens
+            response = await client.messages.create(**api_params)
+            response_data = _parse_response(response, api_set, prompt, response_json, valid_def)
+            break
+        except Exception as e:
+            json_failures += isinstance(e, json.JSONDecodeError)
+            await asyncio.sleep(_prepare_retry(e, attempt, max_retries, json_failures, api_params))
 
-            response = client.messages.create(**api_params)
+    if log_title != "None":
+        queue_log(api_set["model"], prompt, response_data, log_title=log_title)
 
-            response_content = response.content[0].text
-
-            if response_json:
-                try:
-                    response_data = json.loads(response_content)
-
-                    # Validate response if validation function provided
-                    if valid_def:
-                        valid_response = valid_def(response_data)
-                        if valid_response["status"] != "success":
-                            save_log(
-                                api_set["claude_model"],
-                                prompt,
-                                response_data,
-                                log_title="error",
-                                message=valid_response["message"],
-                            )
-                            raise ValueError(f"❎ API response error: {valid_response['message']}")
-
-                    break  # Successfully parsed JSON
-
-                except json.JSONDecodeError as e:
-                    print(f"❎ JSON parsing failed. Retrying: '''{response_content}'''")
-                    save_log(
-                        api_set["model"],
-                        prompt,
-                        response_content,
-                        log_title="error",
-                        message="JSON parsing failed.",
-                    )
-                    if attempt == max_retries - 1:
-                        raise Exception(
-                            f"JSON parsing still failed after {max_retries} attempts: {e}\n"
-                            f"Please check your network connection or API key or `{LOG_FOLDER}/error.json` to debug."
-                        )
-            else:
-                response_data = response_content
-                break
+    return response_data
 
-        except Exception as e:
-            if attempt < max_retries - 1:
-                if isinstance(e, RequestException):
-                    print(f"Request error: {e}. Retrying ({attempt + 1}/{max_retries})...")
-                else:
-                    print(f"Unexpected error occurred: {e}\nRetrying...")
-                time.sleep(2)
-            else:
-                raise Exception(f"Still failed after {max_retries} attempts: {e}")
 
-    with LOCK:
-        if log_title != "None":
-            save_log(api_set["model"], prompt, response_data, log_title=log_title)
+@count_batch_api_calls
+async def ask_claude_many(prompts: List[str], max_concurrent: int = 8, **kwargs: Any) -> List[Any]:
+    """
+    Send several prompts to Claude concurrently.
 
-    return response_data
+    Args:
+        prompts: The prompts to send
+        max_concurrent: Maximum number of requests in flight at once
+        **kwargs: Passed through to `ask_claude_async` for every prompt
+
+    Returns:
+        Responses in the same order as `prompts`; a failed prompt yields its exception instead
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def _ask(prompt: str) -> Any:
+        async with semaphore:
+            return await ask_claude_async(prompt, **kwargs)
+
+    try:
+        return await asyncio.gather(*(_ask(prompt) for prompt in prompts), return_exceptions=True)
+    finally:
+        # cleanup problems are reported, but must not replace the gathered responses
+        try:
+            await flush_logs()
+        except Exception as e:
+            print(f"❎ Failed to flush Claude logs: {e}")
+        try:
+            await close_async_clients()
+        except Exception as e:
+            print(f"❎ Failed to close Claude clients: {e}")
 
 
 if __name__ == "__main__":
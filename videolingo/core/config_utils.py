@@ -1,3 +1,5 @@
+import functools
+import os
 import threading
 from typing import Any
 
@@ -9,11 +11,23 @@ config_lock = threading.Lock()
 yaml = YAML()
 yaml.preserve_quotes = True
 
+# parsed config.yaml, reused until the file's mtime changes
+_CACHE = {"mtime": None, "data": None}
+
+
+def _load_config() -> Any:
+    """Return the parsed config, re-reading the file only when it has changed. Caller must hold `config_lock`."""
+    mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    if _CACHE["data"] is None or _CACHE["mtime"] != mtime:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as file:
+            _CACHE["data"] = yaml.load(file)
+        _CACHE["mtime"] = mtime
+    return _CACHE["data"]
+
 
 def load_key(key: str) -> Any:
     with config_lock:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as file:
-            data = yaml.load(file)
+        data = _load_config()
 
     keys = key.split(".")
     value = data
@@ -27,8 +41,7 @@ def load_key(key: str) -> Any:
 
 def update_key(key: str, new_value: Any) -> bool:
     with config_lock:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as file:
-            data = yaml.load(file)
+        data = _load_config()
 
         keys = key.split(".")
         current = data
@@ -42,16 +55,33 @@ def update_key(key: str, new_value: Any) -> bool:
             current[keys[-1]] = new_value
             with open(CONFIG_PATH, "w", encoding="utf-8") as file:
                 yaml.dump(data, file)
+            _CACHE["data"] = data
+            _CACHE["mtime"] = os.stat(CONFIG_PATH).st_mtime_ns
             return True
         else:
             raise KeyError(f"Key '{keys[-1]}' not found in configuration")
 
 
 # basic utils
+_SPACE = None
+_NOSPACE = None
+_joiner_lock = threading.Lock()
+
+
+def _init_joiners():
+    global _SPACE, _NOSPACE
+    with _joiner_lock:
+        if _SPACE is None:
+            _SPACE = frozenset(load_key("language_split_with_space"))
+            _NOSPACE = frozenset(load_key("language_split_without_space"))
+
+
+@functools.lru_cache(maxsize=64)
 def get_joiner(language):
-    if language in load_key("language_split_with_space"):
+    _init_joiners()
+    if language in _SPACE:
         return " "
-    elif language in load_key("language_split_without_space"):
+    elif language in _NOSPACE:
         return ""
     else:
         raise ValueError(f"Unsupported language code: {language}")
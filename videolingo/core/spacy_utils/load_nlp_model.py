@@ -1,3 +1,6 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
 import spacy
 from rich import print
 from spacy.cli import download
@@ -6,6 +9,10 @@ from videolingo.core.config_utils import load_key
 __all__ = ["init_nlp"]
 
 SPACY_MODEL_MAP = load_key("spacy_model_map")
+# number of sentences handed to `nlp.pipe` at a time by the split stages
+NLP_BATCH_SIZE = 64
+# number of sentences each worker thread parses in `split_docs_parallel`
+NLP_CHUNK_SIZE = 128
 
 
 def get_spacy_model(language: str):
@@ -15,19 +22,56 @@ def get_spacy_model(language: str):
     return model
 
 
-def init_nlp():
+@functools.lru_cache(maxsize=2)
+def _load(model: str):
+    # the split stages only use sentence boundaries, POS and dependencies, so the other components are not
+    # loaded at all; attribute_ruler stays because it maps tagger output to `token.pos_` in these pipelines
+    return spacy.load(model, exclude=["ner", "lemmatizer", "textcat"])
+
+
+def init_nlp(language: str = None):
     try:
-        language = "en" if load_key("whisper.language") == "en" else load_key("whisper.detected_language")
+        if language is None:
+            language = "en" if load_key("whisper.language") == "en" else load_key("whisper.detected_language")
         model = get_spacy_model(language)
         print(f"[blue]⏳ Loading NLP Spacy model: <{model}> ...[/blue]")
         try:
-            nlp = spacy.load(model)
+            nlp = _load(model)
         except:
             print(f"[yellow]Downloading {model} model...[/yellow]")
             print("[yellow]If download failed, please check your network and try again.[/yellow]")
             download(model)
-            nlp = spacy.load(model)
+            nlp = _load(model)
     except:
         raise ValueError(f"❌ Failed to load NLP Spacy model: {model}")
     print("[green]✅ NLP Spacy model loaded successfully![/green]")
     return nlp
+
+
+def split_docs_parallel(nlp, sentences, split_doc):
+    """
+    Parse `sentences` in chunks on a thread pool and return the flattened `split_doc(sentence, doc, log)` results.
+
+    spaCy's parser runs without the GIL, so chunks parse concurrently; the output keeps the input order.
+    Messages passed to `log` are collected per sentence and printed in input order once all chunks are done,
+    so output from different worker threads doesn't interleave.
+    """
+    chunks = [sentences[i : i + NLP_CHUNK_SIZE] for i in range(0, len(sentences), NLP_CHUNK_SIZE)]
+
+    def process_chunk(chunk):
+        results = []
+        for sentence, doc in zip(chunk, nlp.pipe(chunk, batch_size=NLP_BATCH_SIZE)):
+            messages = []
+            results.append((split_doc(sentence, doc, messages.append), messages))
+        return results
+
+    with ThreadPoolExecutor(max_workers=load_key("max_workers")) as executor:
+        chunk_results = list(executor.map(process_chunk, chunks))
+
+    split_sentences = []
+    for chunk_result in chunk_results:
+        for parts, messages in chunk_result:
+            for message in messages:
+                print(message)
+            split_sentences.extend(parts)
+    return split_sentences
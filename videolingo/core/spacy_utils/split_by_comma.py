@@ -7,7 +7,7 @@ import sys
 
 from rich import print
 
-from .load_nlp_model import init_nlp
+from .load_nlp_model import init_nlp, split_docs_parallel
 
 __all__ = ["split_by_comma_main"]
 
@@ -40,7 +40,10 @@ def analyze_comma(start, doc, token):
 
 
 def split_by_comma(text, nlp):
-    doc = nlp(text)
+    return split_doc_by_comma(nlp(text))
+
+
+def split_doc_by_comma(doc, log=print):
     sentences = []
     start = 0
 
@@ -50,13 +53,13 @@ def split_by_comma(text, nlp):
 
             if suitable_for_splitting:
                 sentences.append(doc[start : token.i].text.strip())
-                print(f"[yellow]✂️  Split at comma: {doc[start:token.i][-4:]},| {doc[token.i + 1:][:4]}[/yellow]")
+                log(f"[yellow]✂️  Split at comma: {doc[start:token.i][-4:]},| {doc[token.i + 1:][:4]}[/yellow]")
                 start = token.i + 1
 
     for i, token in enumerate(doc):
         if token.text == ":":  # Split at colon
             sentences.append(doc[start : token.i].text.strip())
-            print(f"[yellow]✂️  Split at colon: {doc[start:token.i][-4:]}:| {doc[token.i + 1:][:4]}[/yellow]")
+            log(f"[yellow]✂️  Split at colon: {doc[start:token.i][-4:]}:| {doc[token.i + 1:][:4]}[/yellow]")
 
     sentences.append(doc[start:].text.strip())
     return sentences
@@ -66,10 +69,8 @@ def split_by_comma_main(nlp):
     with open("output/log/sentence_by_mark.txt", "r", encoding="utf-8") as input_file:
         sentences = input_file.readlines()
 
-    all_split_sentences = []
-    for sentence in sentences:
-        split_sentences = split_by_comma(sentence.strip(), nlp)
-        all_split_sentences.extend(split_sentences)
+    sentences = [sentence.strip() for sentence in sentences]
+    all_split_sentences = split_docs_parallel(nlp, sentences, lambda sentence, doc, log: split_doc_by_comma(doc, log))
 
     with open("output/log/sentence_by_comma.txt", "w", encoding="utf-8") as output_file:
         for sentence in all_split_sentences:
@@ -6,7 +6,7 @@ import sys
 
 from rich import print
 
-from .load_nlp_model import init_nlp
+from .load_nlp_model import NLP_BATCH_SIZE, init_nlp, split_docs_parallel
 
 __all__ = ["split_sentences_main"]
 
@@ -88,9 +88,11 @@ def analyze_connectors(doc, token):
         return True, False
 
 
-def split_by_connectors(text, context_words=5, nlp=None):
-    doc = nlp(text)
+def split_by_connectors(text, context_words=5, nlp=None, doc=None, log=print):
+    if doc is None:
+        doc = nlp(text)
     sentences = [doc.text]  # init
+    docs = [doc]
 
     while True:
         # Handle each task with a single cut
@@ -98,8 +100,7 @@ def split_by_connectors(text, context_words=5, nlp=None):
         split_occurred = False
         new_sentences = []
 
-        for sent in sentences:
-            doc = nlp(sent)
+        for doc in docs:
             start = 0
 
             for i, token in enumerate(doc):
@@ -115,7 +116,7 @@ def split_by_connectors(text, context_words=5, nlp=None):
                 right_words = [word.text for word in right_words if not word.is_punct]
 
                 if len(left_words) >= context_words and len(right_words) >= context_words and split_before:
-                    print(
+                    log(
                         f"[yellow]✂️  Split before '{token.text}': {' '.join(left_words)}| {token.text} {' '.join(right_words)}[/yellow]"
                     )
                     new_sentences.append(doc[start : token.i].text.strip())
@@ -130,6 +131,7 @@ def split_by_connectors(text, context_words=5, nlp=None):
             break
 
         sentences = new_sentences
+        docs = list(nlp.pipe(sentences, batch_size=NLP_BATCH_SIZE))
 
     return sentences
 
@@ -139,11 +141,11 @@ def split_sentences_main(nlp):
     with open("output/log/sentence_by_comma.txt", "r", encoding="utf-8") as input_file:
         sentences = input_file.readlines()
 
-    all_split_sentences = []
+    sentences = [sentence.strip() for sentence in sentences]
     # Process each input sentence
-    for sentence in sentences:
-        split_sentences = split_by_connectors(sentence.strip(), nlp=nlp)
-        all_split_sentences.extend(split_sentences)
+    all_split_sentences = split_docs_parallel(
+        nlp, sentences, lambda sentence, doc, log: split_by_connectors(sentence, nlp=nlp, doc=doc, log=log)
+    )
 
     # output to sentence_splitbyconnector.txt
     with open("output/log/sentence_splitbyconnector.txt", "w+", encoding="utf-8") as output_file:
@@ -7,7 +7,7 @@ import sys
 
 from rich import print
 from videolingo.core.config_utils import get_joiner, load_key
-from videolingo.core.spacy_utils.load_nlp_model import init_nlp
+from videolingo.core.spacy_utils.load_nlp_model import init_nlp, split_docs_parallel
 
 __all__ = ["split_long_by_root_main"]
 
@@ -75,19 +75,19 @@ def split_long_by_root_main(nlp):
     with open("output/log/sentence_splitbyconnector.txt", "r", encoding="utf-8") as input_file:
         sentences = input_file.readlines()
 
-    all_split_sentences = []
-    for sentence in sentences:
-        doc = nlp(sentence.strip())
-        if len(doc) > 60:
-            split_sentences = split_long_sentence(doc)
-            if any(len(nlp(sent)) > 60 for sent in split_sentences):
-                split_sentences = [
-                    subsent for sent in split_sentences for subsent in split_extremely_long_sentence(nlp(sent))
-                ]
-            all_split_sentences.extend(split_sentences)
-            print(f"[yellow]✂️  Splitting long sentences by root: {sentence[:30]}...[/yellow]")
-        else:
-            all_split_sentences.append(sentence.strip())
+    def split_doc(sentence, doc, log):
+        if len(doc) <= 60:
+            return [sentence]
+        split_sentences = split_long_sentence(doc)
+        if any(len(nlp(sent)) > 60 for sent in split_sentences):
+            split_sentences = [
+                subsent for sent in split_sentences for subsent in split_extremely_long_sentence(nlp(sent))
+            ]
+        log(f"[yellow]✂️  Splitting long sentences by root: {sentence[:30]}...[/yellow]")
+        return split_sentences
+
+    sentences = [sentence.strip() for sentence in sentences]
+    all_split_sentences = split_docs_parallel(nlp, sentences, split_doc)
 
     punctuation = string.punctuation + "'" + '"'  # include all punctuation and apostrophe ' and "
 
@@ -7,12 +7,13 @@ from videolingo.core.spacy_utils.split_by_mark import split_by_mark
 from videolingo.core.spacy_utils.split_long_by_root import split_long_by_root_main
 
 
-def split_by_spacy():
+def split_by_spacy(nlp=None):
     if os.path.exists("output/log/sentence_splitbynlp.txt"):
         print("File 'sentence_splitbynlp.txt' already exists. Skipping split_by_spacy.")
         return
 
-    nlp = init_nlp()
+    if nlp is None:
+        nlp = init_nlp()
     split_by_mark(nlp)
     split_by_comma_main(nlp)
     split_sentences_main(nlp)
@@ -124,7 +124,7 @@ def parallel_split_sentences(sentences, max_length, max_workers, nlp, retry_atte
     return [sentence for sublist in new_sentences for sentence in sublist]
 
 
-def split_sentences_by_meaning():
+def split_sentences_by_meaning(nlp=None):
     """The main function to split sentences by meaning."""
     if os.path.exists("output/log/sentence_splitbymeaning.txt"):
         print("File 'sentence_splitbymeaning.txt' already exists. Skipping split_sentences_by_meaning.")
@@ -134,7 +134,8 @@ def split_sentences_by_meaning():
     with open("output/log/sentence_splitbynlp.txt", "r", encoding="utf-8") as f:
         sentences = [line.strip() for line in f.readlines()]
 
-    nlp = init_nlp()
+    if nlp is None:
+        nlp = init_nlp()
     # 🔄 process sentences multiple times to ensure all are split
     for retry_attempt in range(3):
         sentences = parallel_split_sentences(
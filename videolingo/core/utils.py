@@ -17,6 +17,7 @@ TRANS_SUBS_FOR_AUDIO_FILE = "output/audio/trans_subs_for_audio.srt"
 SRC_SUBS_FOR_AUDIO_FILE = "output/audio/src_subs_for_audio.srt"
 SOVITS_TASKS_FILE = "output/audio/tts_tasks.xlsx"
 ESTIMATOR = None
+_PUNCT_RE = re.compile(r"[,.!?;:，。！？；：]")
 
 
 def check_len_then_trim(text, duration):
@@ -51,7 +52,7 @@ def check_len_then_trim(text, duration):
             shortened_text = response["result"]
         except Exception:
             rprint("[bold red]🚫 AI refused to answer due to sensitivity, so manually remove punctuation[/bold red]")
-            shortened_text = re.sub(r"[,.!?;:，。！？；：]", " ", text).strip()
+            shortened_text = _PUNCT_RE.sub(" ", text).strip()
         rprint(
             Panel(
                 f"Subtitle before shortening: {original_text}\nSubtitle after shortening: {shortened_text}",